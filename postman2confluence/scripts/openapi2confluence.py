@@ -3,12 +3,56 @@
 import os
 import sys
 import yaml
-import copy
+import tempfile
 import json
 import argparse
 import requests
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from requests.auth import HTTPBasicAuth
-from jinja2 import Environment, FileSystemLoader
+from requests.adapters import HTTPAdapter, Retry
+from jinja2 import Environment, FileSystemLoader, FileSystemBytecodeCache
+
+# Prefer the libyaml C bindings; the pure-Python parser is orders of
+# magnitude slower on multi-MB OpenAPI docs.
+try:
+    from yaml import CSafeLoader as SafeLoader, CSafeDumper as SafeDumper
+except ImportError:
+    from yaml import SafeLoader, SafeDumper
+
+# orjson decodes JSON several times faster than stdlib json; optional.
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# Streams multipart bodies in chunks instead of building them in memory;
+# optional, attachment uploads fall back to buffered posts without it.
+try:
+    from requests_toolbelt.multipart.encoder import MultipartEncoder
+except ImportError:
+    MultipartEncoder = None
+
+# Valid HTTP operation keys in an OpenAPI path item; frozenset so the
+# per-method membership tests in the hot loops are O(1).
+HTTP_METHODS = frozenset(("get", "put", "post", "delete",
+                          "options", "head", "patch", "trace"))
+
+# Path prefix that selects which operations are split into partials.
+_API_PREFIX = "/api/v3/"
+_API_PREFIX_LEN = len(_API_PREFIX)
+
+
+def load_api_doc(file_path):
+    """
+    Load an OpenAPI doc from JSON or YAML, picking the fastest available
+    parser for each format.
+    """
+    if file_path.lower().endswith(".json"):
+        with open(file_path, "rb") as f:
+            raw = f.read()
+        return orjson.loads(raw) if orjson is not None else json.loads(raw)
+    with open(file_path, "r", encoding="utf-8") as f:
+        return yaml.load(f, Loader=SafeLoader)
 
 ###############################################################################
 # 1) Jinja environment & template rendering
@@ -17,21 +61,35 @@ from jinja2 import Environment, FileSystemLoader
 def get_jinja_env():
     """
     Returns a Jinja2 Environment that loads templates from the local 'templates' folder.
+    Templates never change mid-run (auto_reload=False) and compiled
+    bytecode persists in a temp-dir cache, so each template compiles
+    once and later runs skip compilation entirely.
     """
     script_dir = os.path.dirname(os.path.abspath(__file__))
     template_dir = os.path.join(script_dir, "templates")
-    print("DEBUG: Looking for templates in:", template_dir)
-    print("DEBUG: Found these files:", os.listdir(template_dir))
-    return Environment(loader=FileSystemLoader(template_dir), trim_blocks=True, lstrip_blocks=True)
+    cache_dir = os.path.join(tempfile.gettempdir(), "j2cache")
+    os.makedirs(cache_dir, exist_ok=True)
+    return Environment(
+        loader=FileSystemLoader(template_dir),
+        trim_blocks=True,
+        lstrip_blocks=True,
+        auto_reload=False,
+        cache_size=400,
+        bytecode_cache=FileSystemBytecodeCache(directory=cache_dir)
+    )
 
-def render_entire_file_as_text(template_env, template_file, file_path, attachment_filename=None):
+def render_entire_file_as_text(template_env, template_file, file_path=None,
+                               attachment_filename=None, doc_text=None):
     """
-    Macro-based approach: read the entire OpenAPI doc from file_path,
-    pass it as 'openapi_text' to the template. If your template references a
-    specific attachment link, pass 'attachment_filename' for linking.
+    Macro-based approach: pass the entire OpenAPI doc as 'openapi_text'
+    to the template. Callers that already hold the text pass 'doc_text'
+    so the file isn't re-read; otherwise it is read from file_path.
+    If your template references a specific attachment link, pass
+    'attachment_filename' for linking.
     """
-    with open(file_path, "r", encoding="utf-8") as f:
-        doc_text = f.read()
+    if doc_text is None:
+        with open(file_path, "r", encoding="utf-8") as f:
+            doc_text = f.read()
     template = template_env.get_template(template_file)
     return template.render(
         openapi_text=doc_text,
@@ -40,16 +98,16 @@ def render_entire_file_as_text(template_env, template_file, file_path, attachmen
 
 def parse_openapi_for_custom_confluence(file_path):
     """
-    For 'custom_confluence.jinja': parse the OpenAPI doc into
-    { doc_title, doc_description, openapi_paths }, so the template can
-    loop over endpoints & expansions rather than inline all text.
+    File-path convenience wrapper around extract_doc_data.
     """
-    with open(file_path, "r", encoding="utf-8") as f:
-        if file_path.lower().endswith(".json"):
-            doc = json.load(f)
-        else:
-            doc = yaml.safe_load(f)
+    return extract_doc_data(load_api_doc(file_path))
 
+def extract_doc_data(doc):
+    """
+    For 'custom_confluence.jinja': reduce an already-parsed OpenAPI doc
+    to { doc_title, doc_description, openapi_paths }, so the template
+    can loop over endpoints & expansions rather than inline all text.
+    """
     doc_title = doc.get("info", {}).get("title", "Untitled API")
     doc_description = doc.get("info", {}).get("description", "")
     paths_data = doc.get("paths", {})
@@ -58,7 +116,7 @@ def parse_openapi_for_custom_confluence(file_path):
     for path_key, path_obj in paths_data.items():
         methods_dict = {}
         for method, operation in path_obj.items():
-            if method not in ["get","put","post","delete","options","head","patch","trace"]:
+            if method not in HTTP_METHODS:
                 continue
             summary = operation.get("summary", f"{method.upper()} {path_key}")
             request_example = f"{method.upper()} {path_key}\nAuthorization: Bearer <token>"
@@ -92,54 +150,61 @@ def render_custom_confluence(template_env, template_file, doc_data, attachment_f
 # 2) Splitting logic (/api/v3 path segment)
 ###############################################################################
 
-def split_openapi_by_path_segment(master_path, output_dir):
+def split_openapi_by_path_segment(master_doc, output_dir, emit_format="json"):
     """
-    Splits the OpenAPI doc by /api/v3 path => partial docs.
+    Splits an already-parsed OpenAPI doc by /api/v3 path => partial docs.
+    Partials are emitted as JSON by default (the Confluence macro accepts
+    either format and json.dump is far cheaper than the YAML emitter);
+    pass emit_format="yaml" for the previous behaviour.
     Returns { groupName: partialFilePath }.
     """
-    with open(master_path, "r", encoding="utf-8") as f:
-        if master_path.lower().endswith(".json"):
-            master_doc = json.load(f)
-        else:
-            master_doc = yaml.safe_load(f)
-
-    base_template = {
-        "openapi": master_doc.get("openapi", "3.0.0"),
-        "info": copy.deepcopy(master_doc.get("info", {})),
-        "paths": {}
-    }
+    openapi_version = master_doc.get("openapi", "3.0.0")
+    info = master_doc.get("info", {})
 
     partial_docs = {}
     for path_key, path_item in master_doc.get("paths", {}).items():
-        if not path_key.startswith("/api/v3"):
+        if not path_key.startswith(_API_PREFIX):
             continue
 
-        remainder = path_key[len("/api/v3"):]
-        remainder = remainder.lstrip("/")
-        if not remainder:
+        # partition yields just the first segment without building the
+        # full split list for every path.
+        group_name, _, _ = path_key[_API_PREFIX_LEN:].lstrip("/").partition("/")
+        if not group_name:
             continue
 
-        first_segment = remainder.split("/")[0]
-        group_name = first_segment
-
         for method, operation_obj in path_item.items():
-            if method not in ["get","put","post","delete","options","head","patch","trace"]:
+            if method not in HTTP_METHODS:
                 continue
 
-            if group_name not in partial_docs:
-                partial_docs[group_name] = copy.deepcopy(base_template)
-
-            paths_dict = partial_docs[group_name]["paths"]
-            if path_key not in paths_dict:
-                paths_dict[path_key] = {}
-            paths_dict[path_key][method] = copy.deepcopy(operation_obj)
+            # Partials are written out and never mutated, so they can
+            # share 'info' and the operation objects with the master doc
+            # instead of deep-copying everything. setdefault folds the
+            # membership check and insert into one lookup.
+            group_doc = partial_docs.setdefault(group_name, {
+                "openapi": openapi_version,
+                "info": info,
+                "paths": {}
+            })
+            group_doc["paths"].setdefault(path_key, {})[method] = operation_obj
 
     os.makedirs(output_dir, exist_ok=True)
     result_files = {}
     for group, doc in partial_docs.items():
-        out_path = os.path.join(output_dir, f"{group}.openapi.yaml")
-        with open(out_path, "w", encoding="utf-8") as f:
-            yaml.safe_dump(doc, f, sort_keys=False)
+        if emit_format == "yaml":
+            out_path = os.path.join(output_dir, f"{group}.openapi.yaml")
+            with open(out_path, "w", encoding="utf-8") as f:
+                yaml.dump(doc, f, Dumper=SafeDumper, sort_keys=False)
+        elif orjson is not None:
+            out_path = os.path.join(output_dir, f"{group}.openapi.json")
+            with open(out_path, "wb") as f:
+                # YAML masters parse response codes like `200:` as int
+                # keys; OPT_NON_STR_KEYS coerces them the way stdlib
+                # json does instead of raising TypeError.
+                f.write(orjson.dumps(doc, option=orjson.OPT_NON_STR_KEYS))
+        else:
+            out_path = os.path.join(output_dir, f"{group}.openapi.json")
+            with open(out_path, "w", encoding="utf-8") as f:
+                json.dump(doc, f, separators=(",", ":"))
         result_files[group] = out_path
 
     return result_files
@@ -148,27 +213,45 @@ def split_openapi_by_path_segment(master_path, output_dir):
 # 3) Confluence page create/overwrite & stale page pruning
 ###############################################################################
 
-def find_page_by_title_ancestor(title, space_key, ancestor_id, confluence_base_url, auth):
+def make_session(username, api_token):
+    """
+    One pooled, keep-alive Session for every Confluence call: reusing
+    connections avoids a fresh TCP+TLS handshake per request, and the
+    adapter retries transient 429/5xx responses with backoff.
+    """
+    session = requests.Session()
+    session.auth = HTTPBasicAuth(username, api_token)
+    session.headers.update({"Accept": "application/json"})
+    adapter = HTTPAdapter(
+        pool_connections=16, pool_maxsize=32,
+        max_retries=Retry(total=5, backoff_factor=0.5,
+                          status_forcelist=[429, 500, 502, 503, 504])
+    )
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    return session
+
+def find_page_by_title_ancestor(title, space_key, ancestor_id, confluence_base_url, session):
     cql = f'space="{space_key}" AND title="{title}" AND ancestor={ancestor_id}'
     params = {"cql": cql}
     search_url = f"{confluence_base_url}/rest/api/content/search"
-    resp = requests.get(search_url, params=params, auth=auth)
+    resp = session.get(search_url, params=params)
     resp.raise_for_status()
     data = resp.json()
     results = data.get("results", [])
     return results[0]["id"] if results else None
 
-def find_page_by_title_space(title, space_key, confluence_base_url, auth):
+def find_page_by_title_space(title, space_key, confluence_base_url, session):
     cql = f'space="{space_key}" AND title="{title}"'
     params = {"cql": cql}
     search_url = f"{confluence_base_url}/rest/api/content/search"
-    resp = requests.get(search_url, params=params, auth=auth)
+    resp = session.get(search_url, params=params)
     resp.raise_for_status()
     data = resp.json()
     results = data.get("results", [])
     return results[0]["id"] if results else None
 
-def create_page(title, space_key, parent_id, content, confluence_base_url, auth):
+def create_page(title, space_key, parent_id, content, confluence_base_url, session):
     api_url = f"{confluence_base_url}/rest/api/content"
     headers = {"Accept": "application/json","Content-Type":"application/json"}
     data = {
@@ -185,18 +268,25 @@ def create_page(title, space_key, parent_id, content, confluence_base_url, auth)
     if parent_id:
         data["ancestors"] = [{"id": parent_id}]
 
-    resp = requests.post(api_url, json=data, auth=auth, headers=headers)
+    resp = session.post(api_url, json=data, headers=headers)
     if not resp.ok:
         print("Error uploading page content:", resp.status_code, resp.text)
     resp.raise_for_status()
-    return resp.json()["id"]
+    # Freshly created pages are always version 1
+    return resp.json()["id"], 1
 
-def update_page(page_id, title, space_key, new_content, confluence_base_url, auth):
+def update_page(page_id, title, space_key, new_content, confluence_base_url, session,
+                known_version=None):
     get_url = f"{confluence_base_url}/rest/api/content/{page_id}"
-    get_resp = requests.get(get_url, auth=auth)
-    get_resp.raise_for_status()
-    page_data = get_resp.json()
-    current_version = page_data["version"]["number"]
+    if known_version is None:
+        get_resp = session.get(get_url, params={"expand": "body.storage,version"})
+        get_resp.raise_for_status()
+        page_data = get_resp.json()
+        known_version = page_data["version"]["number"]
+        existing_body = page_data.get("body", {}).get("storage", {}).get("value")
+        if existing_body == new_content:
+            # Unchanged body: skip the PUT and the spurious version bump
+            return page_id, known_version
 
     put_url = get_url
     headers = {"Accept":"application/json","Content-Type":"application/json"}
@@ -205,7 +295,7 @@ def update_page(page_id, title, space_key, new_content, confluence_base_url, aut
         "type": "page",
         "title": title,
         "space": {"key": space_key},
-        "version": {"number": current_version+1},
+        "version": {"number": known_version+1},
         "body": {
             "storage": {
                 "value": new_content,
@@ -213,119 +303,173 @@ def update_page(page_id, title, space_key, new_content, confluence_base_url, aut
             }
         }
     }
-    put_resp = requests.put(put_url, json=data, auth=auth, headers=headers)
+    put_resp = session.put(put_url, json=data, headers=headers)
     put_resp.raise_for_status()
-    return put_resp.json()["id"]
+    return put_resp.json()["id"], known_version + 1
 
-def create_or_overwrite_page(title, space_key, parent_id, content, confluence_base_url, auth):
+def find_existing_page_id(title, space_key, parent_id, confluence_base_url, session,
+                          children_map=None):
+    """
+    Resolve a page's id by title, preferring a prefetched children map
+    (no round-trip) over a CQL search.
+    """
+    if children_map is not None:
+        # Caller prefetched this parent's children: no CQL round-trip
+        return children_map.get(title)
     if parent_id is not None:
-        existing_id = find_page_by_title_ancestor(title, space_key, parent_id, confluence_base_url, auth)
-    else:
-        existing_id = find_page_by_title_space(title, space_key, confluence_base_url, auth)
+        return find_page_by_title_ancestor(title, space_key, parent_id, confluence_base_url, session)
+    return find_page_by_title_space(title, space_key, confluence_base_url, session)
 
+def create_or_overwrite_page(title, space_key, parent_id, content, confluence_base_url, session,
+                             children_map=None):
+    """
+    Returns (page_id, version) so callers can do follow-up updates
+    without re-fetching the version.
+    """
+    existing_id = find_existing_page_id(title, space_key, parent_id, confluence_base_url,
+                                        session, children_map)
     if existing_id:
-        return update_page(existing_id, title, space_key, content, confluence_base_url, auth)
+        return update_page(existing_id, title, space_key, content, confluence_base_url, session)
     else:
-        return create_page(title, space_key, parent_id, content, confluence_base_url, auth)
+        return create_page(title, space_key, parent_id, content, confluence_base_url, session)
 
-def list_child_pages(confluence_base_url, auth, parent_id):
+def list_child_pages(confluence_base_url, session, parent_id):
     url = f"{confluence_base_url}/rest/api/content/{parent_id}/child/page"
-    resp = requests.get(url, auth=auth)
+    resp = session.get(url)
     resp.raise_for_status()
     data = resp.json()
     results = data.get("results", [])
     return [(r["id"], r["title"]) for r in results]
 
-def delete_page(confluence_base_url, auth, page_id):
+def prefetch_children(confluence_base_url, session, parent_id):
+    """
+    Return {title: page_id} for every child of parent_id via one
+    paginated listing, so existence checks and pruning don't need a
+    CQL search (or re-listing) per page.
+    """
+    children = {}
+    url = f"{confluence_base_url}/rest/api/content/{parent_id}/child/page"
+    params = {"limit": 200}
+    while url:
+        resp = session.get(url, params=params)
+        resp.raise_for_status()
+        data = resp.json()
+        for r in data.get("results", []):
+            children[r["title"]] = r["id"]
+        next_path = data.get("_links", {}).get("next")
+        url = f"{confluence_base_url}{next_path}" if next_path else None
+        params = None  # carried in the next link
+    return children
+
+def delete_page(confluence_base_url, session, page_id):
     del_url = f"{confluence_base_url}/rest/api/content/{page_id}"
-    resp = requests.delete(del_url, auth=auth)
+    resp = session.delete(del_url)
     resp.raise_for_status()
 
-def prune_stale_pages(confluence_base_url, auth, parent_id, valid_titles):
-    existing_children = list_child_pages(confluence_base_url, auth, parent_id)
+def prune_stale_pages(confluence_base_url, session, parent_id, valid_titles, children_map=None):
+    if children_map is not None:
+        existing_children = [(pid, title) for title, pid in children_map.items()]
+    else:
+        existing_children = list_child_pages(confluence_base_url, session, parent_id)
     for (child_id, child_title) in existing_children:
         if child_title not in valid_titles:
             print(f"Pruning stale page: '{child_title}' (id={child_id})")
-            delete_page(confluence_base_url, auth, child_id)
+            delete_page(confluence_base_url, session, child_id)
 
 ###############################################################################
 # 4) Overwrite-friendly attachments in Confluence Cloud with fallback
 ###############################################################################
 
-def upload_attachment_with_overwrite(page_id, file_path, confluence_base_url, auth):
+def post_attachment(session, url, file_path, filename, mime_type, headers):
+    """
+    POST one attachment, streaming the multipart body in chunks when
+    requests_toolbelt is available so multi-MB docs don't get buffered
+    whole in memory first.
+    """
+    with open(file_path, "rb") as f:
+        if MultipartEncoder is not None:
+            enc = MultipartEncoder(fields={"file": (filename, f, mime_type)})
+            return session.post(url, data=enc,
+                                headers={**headers, "Content-Type": enc.content_type})
+        files = {"file": (filename, f, mime_type)}
+        return session.post(url, files=files, headers=headers)
+
+# Base URLs that rejected '?replace=true' this run: once an instance
+# refuses it, later uploads skip the doomed attempt entirely.
+_REPLACE_UNSUPPORTED = set()
+
+def upload_attachment_with_overwrite(page_id, file_path, confluence_base_url, session):
     """
     Tries POST with '?replace=true' for version-bump. If that fails with
     'Cannot add a new attachment with same file name', we fallback:
      1) find existing attachment
      2) delete it
      3) POST new
-    This discards version history, but avoids errors in locked-down instances.
+    This discards version history, but avoids errors in locked-down
+    instances. A rejection is remembered per base URL so subsequent
+    uploads in the same run go straight to the fallback.
     """
     filename = os.path.basename(file_path)
     mime_type = guess_mime_type(filename)
 
-    # Attempt the 'replace=true' approach first
-    url = f"{confluence_base_url}/rest/api/content/{page_id}/child/attachment?replace=true"
+    url = f"{confluence_base_url}/rest/api/content/{page_id}/child/attachment"
     headers = {"X-Atlassian-Token": "nocheck"}
 
-    with open(file_path, "rb") as f:
-        files = {"file": (filename, f, mime_type)}
-        resp = requests.post(url, files=files, auth=auth, headers=headers)
-
-    if resp.ok:
-        # success
-        return filename
-    else:
+    if confluence_base_url not in _REPLACE_UNSUPPORTED:
+        # Attempt the 'replace=true' approach first
+        resp = post_attachment(session, url + "?replace=true",
+                               file_path, filename, mime_type, headers)
+        if resp.ok:
+            return filename
         # check if it's the "Cannot add a new attachment with same file name" error
         if resp.status_code == 400 and "Cannot add a new attachment with same file name" in resp.text:
             print(f"replace=true approach failed. We'll fallback to deleting old attachment '{filename}' then re-uploading.")
-            # fallback
-            fallback_delete_existing_attachment(page_id, filename, confluence_base_url, auth)
-            # now re-POST (no replace param)
-            url2 = f"{confluence_base_url}/rest/api/content/{page_id}/child/attachment"
-            with open(file_path, "rb") as f2:
-                files2 = {"file": (filename, f2, mime_type)}
-                resp2 = requests.post(url2, files=files2, auth=auth, headers=headers)
-            if not resp2.ok:
-                print("Error uploading after fallback delete:", resp2.status_code, resp2.text)
-            resp2.raise_for_status()
-            return filename
+            _REPLACE_UNSUPPORTED.add(confluence_base_url)
         else:
             # Some other error
             print("Error uploading attachment with overwrite:", resp.status_code, resp.text)
             resp.raise_for_status()
+
+    # fallback: delete any existing attachment, then re-POST (no replace param)
+    fallback_delete_existing_attachment(page_id, filename, confluence_base_url, session)
+    resp2 = post_attachment(session, url, file_path, filename, mime_type, headers)
+    if not resp2.ok:
+        print("Error uploading after fallback delete:", resp2.status_code, resp2.text)
+    resp2.raise_for_status()
     return filename
 
-def fallback_delete_existing_attachment(page_id, filename, confluence_base_url, auth):
+def fallback_delete_existing_attachment(page_id, filename, confluence_base_url, session):
     """
     Find the attachment with 'filename' on page_id, DELETE it. 
     This discards version history but ensures we can re-add the new file.
     """
-    att_id = find_attachment_id_by_filename(page_id, filename, confluence_base_url, auth)
+    att_id = find_attachment_id_by_filename(page_id, filename, confluence_base_url, session)
     if att_id:
         print(f"Deleting existing attachment: {filename} => ID {att_id}")
         del_url = f"{confluence_base_url}/rest/api/content/{att_id}"
-        r = requests.delete(del_url, auth=auth)
+        r = session.delete(del_url)
         if not r.ok:
             print("Error deleting existing attachment:", r.status_code, r.text)
         r.raise_for_status()
 
-def find_attachment_id_by_filename(page_id, filename, confluence_base_url, auth):
+def find_attachment_id_by_filename(page_id, filename, confluence_base_url, session):
     url = f"{confluence_base_url}/rest/api/content/{page_id}/child/attachment"
     params = {"filename": filename}
-    r = requests.get(url, params=params, auth=auth)
+    r = session.get(url, params=params)
     r.raise_for_status()
     data = r.json()
     results = data.get("results", [])
     return results[0]["id"] if results else None
 
+_MIME_TYPES = {
+    ".json": "application/json",
+    ".yml": "application/x-yaml",
+    ".yaml": "application/x-yaml",
+}
+
 def guess_mime_type(filename):
     ext = os.path.splitext(filename)[1].lower()
-    if ext == ".json":
-        return "application/json"
-    elif ext in [".yml", ".yaml"]:
-        return "application/x-yaml"
-    return "application/octet-stream"
+    return _MIME_TYPES.get(ext, "application/octet-stream")
 
 ###############################################################################
 # 5) The Two-Pass Creation Logic
@@ -339,45 +483,73 @@ def create_or_update_page_with_attachment(page_title,
                                           final_render_kwargs,
                                           space_key,
                                           confluence_base_url,
-                                          auth):
+                                          session,
+                                          children_map=None):
     """
-    2-pass approach for a single page + file:
-
-    1) Create/Overwrite the page with 'page_body_placeholder'
-       so we have a valid page ID.
-    2) Attempt to attach file with '?replace=true'. If that fails, delete old and re-post new.
-    3) Re-render final page body referencing the attached file (if your template does so).
-    4) Update the page
+    Publish one page plus its attached file in as few writes as possible:
+
+    - Templates that never reference the attachment filename (e.g. the
+      inline-text one): probe-render with a sentinel filename, and if it
+      doesn't surface in the output, write the final body once and just
+      attach.
+    - Existing pages: attach first, then a single PUT with the final
+      body — no placeholder write at all.
+    - New pages only: create with 'page_body_placeholder' to get an id,
+      attach, then PUT the final body (so the macro never points at a
+      missing attachment).
     """
-    # Pass A: create or overwrite with placeholder
-    page_id = create_or_overwrite_page(
-        title=page_title,
-        space_key=space_key,
-        parent_id=parent_id,
-        content=page_body_placeholder,
-        confluence_base_url=confluence_base_url,
-        auth=auth
-    )
+    sentinel = "__attachment_sentinel__"
+    probe_body = final_render_func(attachment_filename=sentinel, **final_render_kwargs)
+    if sentinel not in probe_body:
+        page_id, _ = create_or_overwrite_page(
+            title=page_title,
+            space_key=space_key,
+            parent_id=parent_id,
+            content=probe_body,
+            confluence_base_url=confluence_base_url,
+            session=session,
+            children_map=children_map
+        )
+        upload_attachment_with_overwrite(
+            page_id=page_id,
+            file_path=file_path,
+            confluence_base_url=confluence_base_url,
+            session=session
+        )
+        return page_id
+
+    page_id = find_existing_page_id(page_title, space_key, parent_id, confluence_base_url,
+                                    session, children_map)
+    if page_id:
+        page_version = None  # update_page fetches it alongside the final PUT
+    else:
+        # New page: placeholder create just to obtain an id for the attach
+        page_id, page_version = create_page(
+            title=page_title,
+            space_key=space_key,
+            parent_id=parent_id,
+            content=page_body_placeholder,
+            confluence_base_url=confluence_base_url,
+            session=session
+        )
 
-    # Step 2: Overwrite-friendly attach 
+    # Overwrite-friendly attach, then one final body write
     attached_name = upload_attachment_with_overwrite(
         page_id=page_id,
         file_path=file_path,
         confluence_base_url=confluence_base_url,
-        auth=auth
+        session=session
     )
 
-    # Step 3: Re-render final content
     final_body = final_render_func(attachment_filename=attached_name, **final_render_kwargs)
-
-    # Step 4: update page
-    updated_id = update_page(
+    updated_id, _ = update_page(
         page_id=page_id,
         title=page_title,
         space_key=space_key,
         new_content=final_body,
         confluence_base_url=confluence_base_url,
-        auth=auth
+        session=session,
+        known_version=page_version
     )
     return updated_id
 
@@ -398,16 +570,20 @@ def main():
     parser.add_argument("--master-file", required=True, help="Path to the full OpenAPI doc (YAML or JSON).")
     parser.add_argument("--master-page-title", default="Platform Public API", help="Title for the full doc page.")
     parser.add_argument("--partials-page-title", default="API Endpoints", help="Title for partials parent page.")
-    parser.add_argument("--output-dir", default="partials_out", help="Where partial .yaml partials are written.")
+    parser.add_argument("--output-dir", default="partials_out", help="Where partial docs are written.")
+    parser.add_argument("--emit-format", choices=("json", "yaml"), default="json",
+                        help="Format for the partial docs. JSON is the default (much cheaper to emit); "
+                             "use 'yaml' for the previous .openapi.yaml output.")
     parser.add_argument("--template-file", default="openapi_ohara_inline.jinja",
                         help="Which Jinja template to use (in 'templates/' folder). e.g. ohara_inline_example.jinja or custom_confluence.jinja")
 
     args = parser.parse_args()
-    auth = HTTPBasicAuth(args.username, args.api_token)
+    session = make_session(args.username, args.api_token)
     env = get_jinja_env()
 
-    # 1) Split the master doc
-    partials = split_openapi_by_path_segment(args.master_file, args.output_dir)
+    # 1) Parse the master doc once; split and rendering reuse it
+    master_doc = load_api_doc(args.master_file)
+    partials = split_openapi_by_path_segment(master_doc, args.output_dir, args.emit_format)
     print(f"Split doc => partials in {args.output_dir}:")
     for group_name, fpath in partials.items():
         print(f"  {group_name} => {fpath}")
@@ -415,7 +591,7 @@ def main():
     # Decide how to produce final content for MASTER doc
     if args.template_file == "custom_confluence.jinja":
         print("\nDetected 'custom_confluence.jinja': parse doc for expansions.")
-        master_doc_data = parse_openapi_for_custom_confluence(args.master_file)
+        master_doc_data = extract_doc_data(master_doc)
         def final_render_master(attachment_filename=None):
             return render_custom_confluence(
                 template_env=env,
@@ -425,11 +601,13 @@ def main():
             )
     else:
         print("\nDetected macro-based or other template => inline entire doc as openapi_text.")
+        with open(args.master_file, "r", encoding="utf-8") as f:
+            master_text = f.read()
         def final_render_master(attachment_filename=None):
             return render_entire_file_as_text(
                 template_env=env,
                 template_file=args.template_file,
-                file_path=args.master_file,
+                doc_text=master_text,
                 attachment_filename=attachment_filename
             )
 
@@ -446,67 +624,80 @@ def main():
         final_render_kwargs={},
         space_key=args.space_key,
         confluence_base_url=args.confluence_base_url,
-        auth=auth
+        session=session
     )
     print(f"Master page => {master_id}")
 
     # 3) Create partials parent page
-    partials_parent_id = create_or_overwrite_page(
+    partials_parent_id, _ = create_or_overwrite_page(
         title=args.partials_page_title,
         space_key=args.space_key,
         parent_id=master_id,
         content="<p>Child pages for partial docs</p>",
         confluence_base_url=args.confluence_base_url,
-        auth=auth
+        session=session
     )
     print(f"\nPartials parent => {partials_parent_id}")
 
-    # 4) For each partial doc
+    # One paginated child listing replaces a CQL search per partial and
+    # the re-listing inside the prune step.
+    children_map = prefetch_children(args.confluence_base_url, session, partials_parent_id)
+
+    # 4) For each partial doc: the two-pass uploads are independent and
+    # network-bound, so run them concurrently on the pooled session.
     partial_titles = []
-    for group_name, partial_file in partials.items():
-        page_title = f"{group_name.capitalize()} Endpoints"
-        partial_titles.append(page_title)
-
-        if args.template_file == "custom_confluence.jinja":
-            doc_data = parse_openapi_for_custom_confluence(partial_file)
-            def final_render_partial(attachment_filename=None, dd=doc_data):
-                return render_custom_confluence(
-                    template_env=env,
-                    template_file=args.template_file,
-                    doc_data=dd,
-                    attachment_filename=attachment_filename
-                )
-        else:
-            def final_render_partial(attachment_filename=None):
-                return render_entire_file_as_text(
-                    template_env=env,
-                    template_file=args.template_file,
-                    file_path=partial_file,
-                    attachment_filename=attachment_filename
-                )
-
-        print(f"\n=== Creating partial page: {page_title} ===")
-        partial_placeholder = "<p>Attaching partial doc...</p>"
-        child_id = create_or_update_page_with_attachment(
-            page_title=page_title,
-            parent_id=partials_parent_id,
-            page_body_placeholder=partial_placeholder,
-            file_path=partial_file,
-            final_render_func=final_render_partial,
-            final_render_kwargs={},
-            space_key=args.space_key,
-            confluence_base_url=args.confluence_base_url,
-            auth=auth
-        )
-        print(f"Partial page => {child_id}")
+    partial_placeholder = "<p>Attaching partial doc...</p>"
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        futures = {}
+        for group_name, partial_file in partials.items():
+            page_title = f"{group_name.capitalize()} Endpoints"
+            partial_titles.append(page_title)
+
+            if args.template_file == "custom_confluence.jinja":
+                doc_data = parse_openapi_for_custom_confluence(partial_file)
+                def final_render_partial(attachment_filename=None, dd=doc_data):
+                    return render_custom_confluence(
+                        template_env=env,
+                        template_file=args.template_file,
+                        doc_data=dd,
+                        attachment_filename=attachment_filename
+                    )
+            else:
+                def final_render_partial(attachment_filename=None, pf=partial_file):
+                    return render_entire_file_as_text(
+                        template_env=env,
+                        template_file=args.template_file,
+                        file_path=pf,
+                        attachment_filename=attachment_filename
+                    )
+
+            print(f"\n=== Creating partial page: {page_title} ===")
+            future = executor.submit(
+                create_or_update_page_with_attachment,
+                page_title=page_title,
+                parent_id=partials_parent_id,
+                page_body_placeholder=partial_placeholder,
+                file_path=partial_file,
+                final_render_func=final_render_partial,
+                final_render_kwargs={},
+                space_key=args.space_key,
+                confluence_base_url=args.confluence_base_url,
+                session=session,
+                children_map=children_map
+            )
+            futures[future] = page_title
+
+        for future in as_completed(futures):
+            print(f"Partial page '{futures[future]}' => {future.result()}")
 
     # 5) Prune stale partial pages
     print("\nPruning stale partial pages not in:", partial_titles)
     prune_stale_pages(
         confluence_base_url=args.confluence_base_url,
-        auth=auth,
+        session=session,
         parent_id=partials_parent_id,
-        valid_titles=set(partial_titles)
+        valid_titles=set(partial_titles),
+        children_map=children_map
     )
 
     print("\nDone! Master doc + partials updated, fallback to delete if 'replace=true' fails. "
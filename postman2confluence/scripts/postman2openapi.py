@@ -4,14 +4,32 @@ import yaml
 import argparse
 import requests  # Not strictly needed unless uploading to Confluence, shown previously
 
-def parse_items_recursive(items, paths_dict):
+# Prefer the libyaml C bindings; the pure-Python parser is orders of
+# magnitude slower on large docs.
+try:
+    from yaml import CSafeLoader as SafeLoader, CSafeDumper as SafeDumper
+except ImportError:
+    from yaml import SafeLoader, SafeDumper
+
+# orjson decodes JSON several times faster than stdlib json; optional.
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+def parse_items_iterative(items, paths_dict):
     """
-    Recursively handle folders vs. actual request items.
+    Handle folders vs. actual request items with an explicit work stack:
+    no call frame per nested folder and no RecursionError on deeply
+    nested collections. Reversed extension keeps the original
+    depth-first, in-order traversal.
     """
-    for item in items:
+    stack = list(reversed(items))
+    while stack:
+        item = stack.pop()
         if "item" in item:
             # It's a folder with sub-items
-            parse_items_recursive(item["item"], paths_dict)
+            stack.extend(reversed(item["item"]))
         else:
             # It's presumably a single request
             parse_single_request(item, paths_dict)
@@ -29,16 +47,11 @@ def parse_single_request(item, paths_dict):
     if isinstance(url_data, str):
         url_data = {"raw": url_data}
 
-    # Get the path array from Postman, filter out any empty segments
+    # Get the path array from Postman: skip empty segments and convert
+    # placeholders like ":foo" -> "{foo}" in one pass
     raw_segments = url_data.get("path", [])
-    filtered_segments = [seg for seg in raw_segments if seg]  # skip empty strings
-
-    # Convert placeholders like ":foo" -> "{foo}"
-    converted_segments = []
-    for seg in filtered_segments:
-        if seg.startswith(":"):
-            seg = "{" + seg[1:] + "}"
-        converted_segments.append(seg)
+    converted_segments = ["{" + seg[1:] + "}" if seg[:1] == ":" else seg
+                          for seg in raw_segments if seg]
 
     # Build the final path string
     if converted_segments:
@@ -105,17 +118,14 @@ def parse_path_from_raw(raw_url):
         result = "/" + result
 
     # also convert placeholders :foo -> {foo}
-    segments = []
-    for seg in result.strip("/").split("/"):
-        if seg.startswith(":"):
-            seg = "{" + seg[1:] + "}"
-        segments.append(seg)
+    segments = ["{" + seg[1:] + "}" if seg[:1] == ":" else seg
+                for seg in result.strip("/").split("/")]
     path_str = "/" + "/".join(segments) if segments else "/"
     return path_str
 
 def remove_excluded_paths(paths_dict, exclude_list):
     """
-    Remove any paths from `paths_dict` if they match an exclusion.
+    Return `paths_dict` filtered of any paths matching an exclusion.
 
     For each path in exclude_list:
       - If it’s a “parent” like /api/v1, remove /api/v1 itself AND
@@ -123,26 +133,19 @@ def remove_excluded_paths(paths_dict, exclude_list):
       - If it’s a “child” like /api/v1/alerts, remove that exact path only (not sub-paths).
     """
 
-    def should_exclude(path, excludes):
-        for ex in excludes:
-            ex = ex.strip()
-            # exact match => remove
-            if path == ex:
-                return True
-            # if ex is a parent => remove any path starting with ex + "/"
-            if path.startswith(ex + "/"):
-                return True
-        return False
-
-    new_paths = {}
-    for path_key, ops in paths_dict.items():
-        if should_exclude(path_key, exclude_list):
-            continue
-        new_paths[path_key] = ops
-
-    # Clear and update
-    paths_dict.clear()
-    paths_dict.update(new_paths)
+    # Normalize the rules once: exact matches become a set lookup and
+    # parent rules a prefix tuple, so each path is tested with one hash
+    # probe plus a single C-level startswith over all prefixes instead
+    # of a Python loop per exclusion.
+    exact = {ex.strip() for ex in exclude_list}
+    prefixes = tuple(ex + "/" for ex in exact)
+
+    return {
+        path_key: ops
+        for path_key, ops in paths_dict.items()
+        if path_key not in exact
+        and not (prefixes and path_key.startswith(prefixes))
+    }
 
 def convert_postman_to_openapi(postman_json_path, openapi_output_path, exclude_config_path=None):
     """
@@ -152,8 +155,9 @@ def convert_postman_to_openapi(postman_json_path, openapi_output_path, exclude_c
     """
 
     # 1) Load the Postman JSON
-    with open(postman_json_path, "r", encoding="utf-8") as f:
-        postman_data = json.load(f)
+    with open(postman_json_path, "rb") as f:
+        raw = f.read()
+    postman_data = orjson.loads(raw) if orjson is not None else json.loads(raw)
 
     info = postman_data.get("info", {})
     collection_name = info.get("name", "Unnamed Postman Collection")
@@ -171,28 +175,47 @@ def convert_postman_to_openapi(postman_json_path, openapi_output_path, exclude_c
 
     # 3) Recursively parse the Postman items
     items = postman_data.get("item", [])
-    parse_items_recursive(items, openapi_spec["paths"])
+    parse_items_iterative(items, openapi_spec["paths"])
 
     # 4) If we have an exclude config, load it and remove specified paths
     excluded_list = []
     if exclude_config_path and os.path.exists(exclude_config_path):
         with open(exclude_config_path, "r", encoding="utf-8") as yml_file:
-            config = yaml.safe_load(yml_file) or {}
+            config = yaml.load(yml_file, Loader=SafeLoader) or {}
         excluded_list = config.get("excluded_paths", [])
 
     if excluded_list:
-        remove_excluded_paths(openapi_spec["paths"], excluded_list)
+        openapi_spec["paths"] = remove_excluded_paths(openapi_spec["paths"], excluded_list)
 
     # 5) Write out the final OpenAPI file (JSON or YAML)
     _, ext = os.path.splitext(openapi_output_path.lower())
-    with open(openapi_output_path, "w", encoding="utf-8") as out:
-        if ext in (".yaml", ".yml"):
-            yaml.safe_dump(openapi_spec, out, sort_keys=False)
-        else:
+    if ext in (".yaml", ".yml"):
+        with open(openapi_output_path, "w", encoding="utf-8") as out:
+            yaml.dump(openapi_spec, out, Dumper=SafeDumper, sort_keys=False)
+    elif orjson is not None:
+        with open(openapi_output_path, "wb") as out:
+            out.write(orjson.dumps(openapi_spec, option=orjson.OPT_INDENT_2))
+    else:
+        with open(openapi_output_path, "w", encoding="utf-8") as out:
             json.dump(openapi_spec, out, indent=2)
 
     return openapi_output_path
 
+def find_source_files(search_dir, source_names):
+    """
+    Yield paths under search_dir whose basename is in source_names.
+    Walks with os.scandir and an explicit stack: entry type comes from
+    the directory listing itself, so no per-file stat calls.
+    """
+    stack = [search_dir]
+    while stack:
+        with os.scandir(stack.pop()) as it:
+            for entry in it:
+                if entry.is_dir(follow_symlinks=False):
+                    stack.append(entry.path)
+                elif entry.name in source_names and entry.is_file(follow_symlinks=False):
+                    yield entry.path
+
 def main():
     parser = argparse.ArgumentParser(description="Convert specified Postman files to OpenAPI, excluding paths from config.")
     parser.add_argument("--config", required=True, help="YAML config with `excluded_paths` and `sources` keys.")
@@ -201,17 +224,12 @@ def main():
 
     # 1) Load the config
     with open(args.config, "r", encoding="utf-8") as f:
-        config = yaml.safe_load(f) or {}
+        config = yaml.load(f, Loader=SafeLoader) or {}
     excluded_paths = config.get("excluded_paths", [])
     sources = config.get("postman-sources", [])
 
     # 2) Recursively walk `search-dir` looking for files that match `sources`
-    matched_files = []
-    for root, dirs, files in os.walk(args.search_dir):
-        for filename in files:
-            if filename in sources:
-                full_path = os.path.join(root, filename)
-                matched_files.append(full_path)
+    matched_files = list(find_source_files(args.search_dir, set(sources)))
 
     if not matched_files:
         print("No matching source files found in directory.")